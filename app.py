@@ -1,8 +1,14 @@
+import functools
+import os
 import time
+
+import pandas as pd
 import streamlit as st
 
-from src.puzzle_generator import PuzzleGenerator
-from src.tracker import PerformanceTracker
+from src.profiles import ProfileStore
+from src.puzzle_generator import Puzzle, PuzzleGenerator
+from src.review_scheduler import ReviewScheduler
+from src.tracker import ANSWER_MAX, ANSWER_MIN, PerformanceTracker
 from src.adaptive_engine import AdaptiveEngine
 
 # Dancing animal GIFs (fox, panda, cat, dog)
@@ -13,6 +19,14 @@ DANCING_CARTOONS = [
     "https://media.giphy.com/media/26tPplGWjN0xLybiU/giphy.gif",   # dancing dog
 ]
 
+PROFILE_DB = os.path.join("data", "profiles.sqlite3")
+
+
+@st.cache_resource
+def get_profile_store() -> ProfileStore:
+    """One profile store (and LRU) shared by every session in this process."""
+    return ProfileStore(PROFILE_DB)
+
 
 def init_state():
     if "initialized" not in st.session_state:
@@ -21,6 +35,7 @@ def init_state():
         st.session_state.generator = PuzzleGenerator()
         st.session_state.tracker = PerformanceTracker()
         st.session_state.engine = AdaptiveEngine(initial_level="easy")
+        st.session_state.reviews = ReviewScheduler()
         st.session_state.current_puzzle = None
         st.session_state.question_index = 0
         st.session_state.max_questions = 10
@@ -28,6 +43,10 @@ def init_state():
         st.session_state.last_feedback = ""
         st.session_state.finished = False
         st.session_state.started = False
+        st.session_state.profile_name = ""  # name as typed; blank means don't remember
+        st.session_state.profile = None     # LearnerProfile for returning learners
+        st.session_state.start_level = "easy"
+        st.session_state.profile_saved = False
 
         # Rewards & cartoon state
         st.session_state.coins = 0
@@ -38,98 +57,116 @@ def init_state():
 
 
 def start_new_puzzle():
-    """Create a new puzzle based on the current difficulty."""
+    """Serve a due review if there is one, otherwise a new puzzle at the current difficulty."""
     engine = st.session_state.engine
     gen = st.session_state.generator
+    reviews = st.session_state.reviews
 
-    level = engine.current_level
-    puzzle = gen.generate(level)
+    st.session_state.question_index += 1
+
+    item = reviews.pop_due(st.session_state.question_index)
+    if item is not None:
+        puzzle = Puzzle(
+            question=item.question,
+            answer=item.answer,
+            difficulty=item.difficulty,
+            operation="review",
+        )
+    else:
+        puzzle = gen.generate(engine.current_level)
 
     st.session_state.current_puzzle = puzzle
-    st.session_state.question_index += 1
     st.session_state.start_time = time.perf_counter()
     st.session_state.last_feedback = ""
     st.session_state.hero_mood = "thinking"  # thinking while solving
 
 
+# Built once per process; only sent to the browser on full reruns
+CUSTOM_STYLES = """
+    <style>
+
+    /* ---------- GLOBAL BACKGROUND (RED GRADIENT) ---------- */
+    .stApp {
+        background: radial-gradient(circle at top left,
+            #ff9a9e 0%,
+            #ff6a00 35%,
+            #ff4e50 70%,
+            #f9d423 100%) !important;
+        background-attachment: fixed;
+    }
+
+    /* ---------- MAKE ALL BASE TEXT BLACK ---------- */
+    body, p, div, span, label, h1, h2, h3, h4 {
+        color: #000000 !important;
+    }
+
+    .stMarkdown, .stText, .stCaption, .stRadio label,
+    .stSelectbox label, .stSlider label {
+        color: #000000 !important;
+    }
+
+    /* ---------- CARD CONTAINER ---------- */
+    .card {
+        padding: 1.3rem 1.5rem;
+        border-radius: 22px;
+        background: rgba(255,255,255,0.92);
+        color: #000000 !important;
+        backdrop-filter: blur(12px);
+        box-shadow: 0 14px 35px rgba(0,0,0,0.25);
+        border: 1px solid rgba(255,255,255,0.8);
+    }
+
+    /* ---------- BADGES ---------- */
+    .badge {
+        display: inline-block;
+        padding: 0.25rem 0.75rem;
+        border-radius: 999px;
+        font-size: 0.85rem;
+        font-weight: 650;
+        background: linear-gradient(135deg, #ff512f 0%, #dd2476 100%);
+        color: #ffffff !important;
+    }
+
+    /* ---------- METRIC LABELS ---------- */
+    .stMetricLabel, .stMetricValue {
+        color: #000000 !important;
+        text-shadow: none !important;
+    }
+
+    /* ---------- INPUT BOXES ---------- */
+    .stTextInput > div > div > input {
+        background: rgba(255,255,255,0.95) !important;
+        border-radius: 14px !important;
+        color: #000000 !important;
+        border: 1px solid rgba(255,255,255,0.85);
+    }
+
+    /* ---------- BUTTON TEXT ---------- */
+    button[kind="primary"], button[kind="secondary"] {
+        color: #ffffff !important;
+    }
+
+    /* ---------- MOVE CONTENT LEFT ---------- */
+    .main .block-container {
+        padding-left: 0.8rem;
+        padding-right: 1.5rem;
+        max-width: 1200px;
+    }
+
+    </style>
+"""
+
+INTRO_CARD = (
+    "<div class='card'>"
+    "Practice basic math (addition, subtraction, multiplication, division). "
+    "The system tracks your performance and <b>automatically adjusts</b> the difficulty."
+    "</div>"
+)
+
+
 def apply_custom_styles():
     """Inject custom CSS for a red gradient UI with ALL text black."""
-    st.markdown(
-        """
-        <style>
-
-        /* ---------- GLOBAL BACKGROUND (RED GRADIENT) ---------- */
-        .stApp {
-            background: radial-gradient(circle at top left,
-                #ff9a9e 0%,
-                #ff6a00 35%,
-                #ff4e50 70%,
-                #f9d423 100%) !important;
-            background-attachment: fixed;
-        }
-
-        /* ---------- MAKE ALL BASE TEXT BLACK ---------- */
-        body, p, div, span, label, h1, h2, h3, h4 {
-            color: #000000 !important;
-        }
-
-        .stMarkdown, .stText, .stCaption, .stRadio label,
-        .stSelectbox label, .stSlider label {
-            color: #000000 !important;
-        }
-
-        /* ---------- CARD CONTAINER ---------- */
-        .card {
-            padding: 1.3rem 1.5rem;
-            border-radius: 22px;
-            background: rgba(255,255,255,0.92);
-            color: #000000 !important;
-            backdrop-filter: blur(12px);
-            box-shadow: 0 14px 35px rgba(0,0,0,0.25);
-            border: 1px solid rgba(255,255,255,0.8);
-        }
-
-        /* ---------- BADGES ---------- */
-        .badge {
-            display: inline-block;
-            padding: 0.25rem 0.75rem;
-            border-radius: 999px;
-            font-size: 0.85rem;
-            font-weight: 650;
-            background: linear-gradient(135deg, #ff512f 0%, #dd2476 100%);
-            color: #ffffff !important;
-        }
-
-        /* ---------- METRIC LABELS ---------- */
-        .stMetricLabel, .stMetricValue {
-            color: #000000 !important;
-            text-shadow: none !important;
-        }
-
-        /* ---------- INPUT BOXES ---------- */
-        .stTextInput > div > div > input {
-            background: rgba(255,255,255,0.95) !important;
-            border-radius: 14px !important;
-            color: #000000 !important;
-            border: 1px solid rgba(255,255,255,0.85);
-        }
-
-        /* ---------- BUTTON TEXT ---------- */
-        button[kind="primary"], button[kind="secondary"] {
-            color: #ffffff !important;
-        }
-
-        /* ---------- MOVE CONTENT LEFT ---------- */
-        .main .block-container {
-            padding-left: 0.8rem;
-            padding-right: 1.5rem;
-            max-width: 1200px;
-        }
-
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(CUSTOM_STYLES, unsafe_allow_html=True)
 
 
 def main():
@@ -140,42 +177,23 @@ def main():
     tracker = st.session_state.tracker
     engine = st.session_state.engine
 
-    # Header with cartoon + (conditional) dancing buddies + stats
-    col_left, col_right = st.columns([1, 2])
-
-    with col_left:
-        show_main_cartoon()
-
-        # Mini dancing buddies ONLY when last answer was correct (happy)
-        if st.session_state.hero_mood == "happy":
-            st.markdown("### 🐾 Dancing buddies")
-            show_mini_cartoons()
-
-    with col_right:
-        st.title("🧠 Math Adventures")
-        st.markdown(
-            "<div class='card'>"
-            "Practice basic math (addition, subtraction, multiplication, division). "
-            "The system tracks your performance and <b>automatically adjusts</b> the difficulty."
-            "</div>",
-            unsafe_allow_html=True,
-        )
+    # Static header
+    st.title("🧠 Math Adventures")
+    st.markdown(INTRO_CARD, unsafe_allow_html=True)
 
-    # Rewards bar
-    st.markdown("### ⭐ Rewards")
-    c1, c2, c3 = st.columns(3)
-    with c1:
-        st.metric("Coins", st.session_state.coins, help="Earn 10 coins for every correct answer!")
-    with c2:
-        st.metric("Current Streak", st.session_state.streak)
-    with c3:
-        st.metric("Best Streak", st.session_state.best_streak)
-
-    # Sidebar
+    # Sidebar (difficulty and progress are shown on the question card)
     with st.sidebar:
         st.header("⚙️ Session Controls")
-        st.write(f"Difficulty: **{engine.current_level.capitalize()}**")
-        st.write(f"Questions answered: **{tracker.total_attempts}**")
+        if st.session_state.profile is not None:
+            st.write(
+                f"Welcome back! Lifetime accuracy: "
+                f"**{st.session_state.profile.accuracy * 100:.0f}%**"
+            )
+            st.write(
+                f"Started at **{st.session_state.start_level.capitalize()}** "
+                f"(your recommended level is "
+                f"**{st.session_state.profile.recommended_level.capitalize()}**)"
+            )
 
         st.session_state.max_questions = st.slider(
             "Total questions this session",
@@ -193,26 +211,41 @@ def main():
 
     # If finished, show summary
     if st.session_state.finished:
+        rewards_bar()
         show_summary()
         return
 
     # Start screen: name + initial difficulty
     if not st.session_state.started:
+        rewards_bar()
         with st.form("start_form"):
             st.subheader("👋 Let's get to know you")
             name = st.text_input("Your name", value=st.session_state.name, placeholder="Type your name")
             difficulty = st.selectbox(
                 "Choose starting difficulty",
-                options=["Easy", "Medium", "Hard"],
-                index=["Easy", "Medium", "Hard"].index(
-                    engine.current_level.capitalize()
-                ),
+                options=["Recommended", "Easy", "Medium", "Hard"],
+                index=0,
+                help="Recommended continues where a returning learner left off (Easy for new learners).",
             )
             submitted = st.form_submit_button("🚀 Start Adventure!")
 
         if submitted:
             st.session_state.name = name.strip() or "Learner"
-            engine.current_index = engine.levels.index(difficulty.lower())
+
+            # Returning learner: pick up where they left off, unless they
+            # chose a level themselves
+            st.session_state.profile_name = name.strip()
+            profile = get_profile_store().get(name) if name.strip() else None
+            st.session_state.profile = profile
+            if difficulty != "Recommended":
+                level = difficulty.lower()
+            elif profile is not None:
+                level = profile.recommended_level
+            else:
+                level = "easy"
+            engine.current_index = engine.levels.index(level)
+            st.session_state.start_level = level
+
             st.session_state.started = True
             st.session_state.finished = False
             st.session_state.current_puzzle = None
@@ -225,22 +258,65 @@ def main():
             st.info("Enter your name and choose a starting difficulty to begin.")
             return
 
-    # After start: if we don't currently have a puzzle and we're not finished,
-    # create the NEXT puzzle now.
-    if (
-        st.session_state.started
-        and not st.session_state.finished
-        and st.session_state.current_puzzle is None
-        and tracker.total_attempts < st.session_state.max_questions
-    ):
-        start_new_puzzle()
-
-    # If still no puzzle (e.g., reached max questions), go to summary
-    if st.session_state.current_puzzle is None:
+    # Reached max questions (e.g. the slider was lowered): go to summary
+    if st.session_state.current_puzzle is None and tracker.total_attempts >= st.session_state.max_questions:
         st.session_state.finished = True
+        rewards_bar()
         show_summary()
         return
 
+    play_area()
+
+
+@st.fragment
+def play_area():
+    """
+    Rewards bar + current question.
+
+    Answer submissions rerun only this fragment (the answer itself is
+    handled in the submit callback), so the CSS, header and sidebar are
+    not rebuilt for every answer. Streamlit fragments cannot
+    trigger one another, so the rewards bar lives in the same fragment
+    as the question it reacts to.
+    """
+    # Session just ended: the summary needs a full-page rerun
+    if st.session_state.finished:
+        st.rerun()
+
+    # Draw the mascot before the next puzzle resets its mood to "thinking"
+    rewards_bar()
+
+    # If we don't currently have a puzzle, create the NEXT one now
+    if st.session_state.current_puzzle is None:
+        start_new_puzzle()
+
+    question_area()
+
+
+def rewards_bar():
+    """Mascot (with dancing buddies after a correct answer) next to the reward metrics."""
+    col_left, col_right = st.columns([1, 2])
+
+    with col_left:
+        show_main_cartoon()
+
+    with col_right:
+        st.markdown("### ⭐ Rewards")
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            st.metric("Coins", st.session_state.coins, help="Earn 10 coins for every correct answer!")
+        with c2:
+            st.metric("Current Streak", st.session_state.streak)
+        with c3:
+            st.metric("Best Streak", st.session_state.best_streak)
+
+    # Mini dancing buddies ONLY when last answer was correct (happy)
+    if st.session_state.hero_mood == "happy":
+        st.markdown("### 🐾 Dancing buddies")
+        show_mini_cartoons()
+
+
+def question_area():
     puzzle = st.session_state.current_puzzle
 
     st.markdown("### ❓ Question time")
@@ -254,17 +330,22 @@ def main():
     )
 
     with st.form("answer_form", clear_on_submit=True):
-        answer = st.text_input("Your answer", "", placeholder="Type your answer here")
-        submitted = st.form_submit_button("Submit ✅")
-
-    if submitted:
-        process_answer(answer)
+        st.text_input("Your answer", "", key="answer_input", placeholder="Type your answer here")
+        st.form_submit_button("Submit ✅", on_click=submit_answer)
 
     if st.session_state.last_feedback:
         st.markdown("---")
         st.markdown(f"<div class='card'>{st.session_state.last_feedback}</div>", unsafe_allow_html=True)
 
 
+def submit_answer():
+    """
+    Answer form callback. Runs before the play area reruns, so the
+    redrawn rewards bar and next question already reflect this answer.
+    """
+    process_answer(st.session_state.answer_input)
+
+
 def process_answer(raw_answer: str):
     """Check the user's answer against the CURRENT puzzle, then clear it."""
     tracker = st.session_state.tracker
@@ -286,6 +367,9 @@ def process_answer(raw_answer: str):
     try:
         if raw:
             user_answer = int(raw)
+            # Too long for the tracker to store (and never the answer)
+            if not ANSWER_MIN <= user_answer <= ANSWER_MAX:
+                user_answer = None
         correct_answer = int(puzzle.answer)
         correct = (user_answer == correct_answer)
     except ValueError:
@@ -303,6 +387,9 @@ def process_answer(raw_answer: str):
         difficulty=puzzle.difficulty,
     )
 
+    # Schedule missed questions (and reviewed ones) to come back later
+    st.session_state.reviews.record_attempt(tracker.attempts[-1], st.session_state.question_index)
+
     # Update rewards & mood
     if correct:
         st.session_state.streak += 1
@@ -320,7 +407,11 @@ def process_answer(raw_answer: str):
         st.session_state.hero_mood = "sad"     # no dancing, show sad/neutral
 
     # Update difficulty using recent performance
-    recent_results = tracker.recent_correctness()
+    # Returning learners carry their last few answers into the window
+    recent_results = tracker.recent_correctness(n=engine.window_size)
+    profile = st.session_state.profile
+    if profile is not None and len(recent_results) < engine.window_size:
+        recent_results = (profile.recent_results + recent_results)[-engine.window_size:]
     new_level = engine.update_level(recent_results)
 
     # Build feedback message
@@ -354,13 +445,11 @@ def process_answer(raw_answer: str):
     # Clear the current puzzle; the NEXT run will create a new one
     st.session_state.current_puzzle = None
 
-    # If we hit max questions, mark finished; summary will show on next run
+    # If we hit max questions, mark finished; the play area hands over to
+    # the summary on its next run
     if tracker.total_attempts >= st.session_state.max_questions:
         st.session_state.finished = True
 
-    # Force a rerun so the next puzzle (or summary) is shown immediately
-    st.rerun()
-
 
 def show_summary():
     tracker = st.session_state.tracker
@@ -373,6 +462,11 @@ def show_summary():
         st.info("No questions answered this session. Try again!")
         return
 
+    # Remember this learner for next time (once per session)
+    if not st.session_state.profile_saved and st.session_state.profile_name:
+        get_profile_store().record_session(st.session_state.profile_name, tracker, engine.current_level)
+        st.session_state.profile_saved = True
+
     accuracy_percent = tracker.accuracy * 100
 
     st.markdown(
@@ -401,26 +495,37 @@ def show_summary():
     st.write(f"⏱ **Average time per question:** {tracker.average_time:.2f} seconds")
     st.write(f"🎯 **Recommended next level:** {engine.current_level.capitalize()}")
 
+    history = tracker.to_frame()
+
+    st.markdown("---")
+    st.subheader("📈 How you did")
+    col_time, col_level = st.columns(2)
+    with col_time:
+        st.caption("Seconds per question")
+        st.line_chart(history["time_taken"].set_axis(range(1, len(history) + 1)))
+    with col_level:
+        st.caption("Accuracy by difficulty (%)")
+        by_level = history.groupby("difficulty", observed=True)["correct"].mean() * 100
+        st.bar_chart(by_level.rename(index=str.capitalize))
+
     # Show detailed mistakes
-    wrong_attempts = [a for a in tracker.attempts if not a.correct]
+    wrong = history[~history["correct"]]
 
-    if wrong_attempts:
+    if not wrong.empty:
         st.markdown("---")
         st.subheader("❌ Where you went wrong")
 
-        rows = []
-        for i, a in enumerate(wrong_attempts, start=1):
-            rows.append(
-                {
-                    "#": i,
-                    "Question": a.question,
-                    "Your answer": "—" if a.user_answer is None else a.user_answer,
-                    "Correct answer": a.correct_answer,
-                    "Difficulty": a.difficulty.capitalize(),
-                }
-            )
-
-        st.table(rows)
+        your_answer = wrong["user_answer"].astype(object)
+        table = pd.DataFrame(
+            {
+                "Question": wrong["question"],
+                "Your answer": your_answer.where(wrong["user_answer"].notna(), "—"),
+                "Correct answer": wrong["correct_answer"],
+                "Difficulty": wrong["difficulty"].astype(str).str.capitalize(),
+            }
+        ).set_axis(pd.RangeIndex(1, len(wrong) + 1, name="#"))
+
+        st.table(table)
     else:
         st.success("🔥 Perfect session! You got everything correct.")
 
@@ -440,26 +545,19 @@ def show_main_cartoon():
       - Static cute card otherwise (neutral / thinking / sad)
     """
     mood = st.session_state.get("hero_mood", "neutral")
+    idx = st.session_state.get("cartoon_index", 0) if mood == "happy" else 0
+    st.markdown(cartoon_card(mood, idx), unsafe_allow_html=True)
+
 
-    # When correct: show dancing GIF
+@functools.lru_cache(maxsize=None)
+def cartoon_card(mood: str, cartoon_index: int) -> str:
+    """HTML for the mascot card; there are only a handful, so each is built once per process."""
+    # When correct: dancing GIF
     if mood == "happy":
-        idx = st.session_state.get("cartoon_index", 0)
-        gif = DANCING_CARTOONS[idx]
-        st.markdown(
-            f"""
-            <div style="
-                text-align:center;
-                padding: 0.8rem;
-                border-radius: 18px;
-                background: rgba(255,255,255,0.9);
-                box-shadow: 0 4px 16px rgba(0,0,0,0.15);
-                width: 180px;
-            ">
-                <img src="{gif}" width="150">
-                <div style="font-size:0.85rem; margin-top:0.4rem;">Yay! You got it right! 🎉</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
+        gif = DANCING_CARTOONS[cartoon_index]
+        body = (
+            f'<img src="{gif}" width="150">'
+            f'<div style="font-size:0.85rem; margin-top:0.4rem;">Yay! You got it right! 🎉</div>'
         )
     else:
         # Static friendly card
@@ -473,23 +571,18 @@ def show_main_cartoon():
             emoji = "🦊"
             text = "Welcome! Let's start your adventure!"
 
-        st.markdown(
-            f"""
-            <div style="
-                text-align:center;
-                padding: 0.8rem;
-                border-radius: 18px;
-                background: rgba(255,255,255,0.9);
-                box-shadow: 0 4px 16px rgba(0,0,0,0.15);
-                width: 180px;
-            ">
-                <div style="font-size:2.5rem;">{emoji}</div>
-                <div style="font-size:0.85rem; margin-top:0.4rem;">{text}</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
+        body = (
+            f'<div style="font-size:2.5rem;">{emoji}</div>'
+            f'<div style="font-size:0.85rem; margin-top:0.4rem;">{text}</div>'
         )
 
+    return (
+        '<div style="text-align:center; padding: 0.8rem; border-radius: 18px; '
+        'background: rgba(255,255,255,0.9); box-shadow: 0 4px 16px rgba(0,0,0,0.15); width: 180px;">'
+        f"{body}"
+        "</div>"
+    )
+
 
 def show_mini_cartoons():
     """Show three smaller dancing animal gifs (only called when hero_mood == 'happy')."""
@@ -0,0 +1,151 @@
+"""
+Round-trip check and benchmark for the columnar archive (src/archive.py).
+
+Writes generated sessions for a few learners (spread over several `add`
+calls, with answers that are missing, wrong or negative), then checks the
+reader against the original trackers before timing anything:
+
+- attempts() decodes every row exactly (times to float32 precision)
+- summary() and range_summary() match the trackers, including ranges
+  that start or stop inside a block and span several `add` calls
+
+Exits with status 1 if any check fails.
+
+Run from the project root:
+    python benchmarks/bench_archive.py
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.archive import ArchiveReader, ArchiveWriter  # noqa: E402
+from src.puzzle_generator import PuzzleGenerator  # noqa: E402
+from src.tracker import PerformanceTracker  # noqa: E402
+
+
+def build_tracker(size: int, rng: random.Random) -> PerformanceTracker:
+    generator = PuzzleGenerator()
+    tracker = PerformanceTracker()
+    for _ in range(size):
+        puzzle = generator.generate(rng.choice(["easy", "medium", "hard"]))
+        user_answer = rng.choice([None, puzzle.answer, puzzle.answer + rng.randint(-300, 3), -rng.randint(0, 10**6)])
+        tracker.log_attempt(
+            question=puzzle.question,
+            correct_answer=puzzle.answer,
+            user_answer=user_answer,
+            correct=user_answer == puzzle.answer,
+            time_taken=rng.random() * 20,
+            difficulty=puzzle.difficulty,
+        )
+    return tracker
+
+
+def expected_summary(attempts) -> dict:
+    total = len(attempts)
+    correct = sum(a.correct for a in attempts)
+    return {"total_attempts": total, "num_correct": correct}
+
+
+def check(reader: ArchiveReader, trackers: dict, rng: random.Random) -> list:
+    failures = []
+
+    for name, tracker in trackers.items():
+        decoded = reader.attempts(name)
+        if len(decoded) != tracker.total_attempts:
+            failures.append(f"{name}: decoded {len(decoded)} rows, expected {tracker.total_attempts}")
+        for i, (got, want) in enumerate(zip(decoded, tracker.attempts)):
+            if (
+                got.question != want.question
+                or got.correct_answer != want.correct_answer
+                or got.user_answer != want.user_answer
+                or got.correct != want.correct
+                or got.difficulty != want.difficulty
+                or abs(got.time_taken - want.time_taken) > 1e-5 * max(1.0, want.time_taken)
+            ):
+                failures.append(f"{name}[{i}]: decoded {got}, expected {want}")
+                break
+
+        summary = reader.summary(name)
+        want = expected_summary(tracker.attempts)
+        for key, value in want.items():
+            if summary[key] != value:
+                failures.append(f"{name}: summary {key}={summary[key]}, expected {value}")
+
+        for _ in range(50):
+            start = rng.randint(0, tracker.total_attempts)
+            stop = rng.randint(start, tracker.total_attempts)
+            ranged = reader.range_summary(name, start, stop)
+            want = expected_summary(tracker.attempts[start:stop])
+            for key, value in want.items():
+                if ranged[key] != value:
+                    failures.append(f"{name}[{start}:{stop}]: {key}={ranged[key]}, expected {value}")
+
+            rows = reader.attempts(name, start, stop)
+            if [a.question for a in rows] != [a.question for a in tracker.attempts[start:stop]]:
+                failures.append(f"{name}[{start}:{stop}]: attempts() returned the wrong rows")
+
+    if reader.summary("nobody")["total_attempts"] != 0:
+        failures.append("unknown learner has attempts")
+
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check and benchmark the attempt archive.")
+    parser.add_argument("--learners", type=int, default=4)
+    parser.add_argument("--attempts", type=int, default=5000, help="attempts per learner")
+    parser.add_argument("--block-rows", type=int, default=700)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    trackers = {f"learner-{i}": build_tracker(args.attempts, rng) for i in range(args.learners)}
+    path = os.path.join(tempfile.mkdtemp(), "history.mada")
+
+    start = time.perf_counter()
+    with ArchiveWriter(path, block_rows=args.block_rows) as writer:
+        # Two add() calls per learner, interleaved, so first_row bookkeeping is exercised
+        split = args.attempts // 3
+        for name, tracker in trackers.items():
+            writer.add(name, tracker.attempts[:split])
+        for name, tracker in trackers.items():
+            writer.add(name, tracker.attempts[split:])
+    write_time = time.perf_counter() - start
+
+    total = args.learners * args.attempts
+    print(f"wrote {total:,} attempts in {write_time:.2f}s, {os.path.getsize(path) / total:.1f} bytes/attempt")
+
+    with ArchiveReader(path) as reader:
+        failures = check(reader, trackers, rng)
+        index = reader.index  # a caller holding the index must not block close()
+
+        name = next(iter(trackers))
+        for label, query in (
+            ("summary", lambda: reader.summary(name)),
+            ("range_summary", lambda: reader.range_summary(name, 123, args.attempts - 77)),
+            ("attempts (full decode)", lambda: reader.attempts(name)),
+        ):
+            repeats = 20
+            start = time.perf_counter()
+            for _ in range(repeats):
+                query()
+            print(f"{label:<24} {(time.perf_counter() - start) / repeats * 1e3:>9.3f} ms")
+
+    print(f"index rows kept after close: {len(index)}")
+
+    if failures:
+        print(f"\n{len(failures)} check(s) failed:")
+        for line in failures[:20]:
+            print(f"  {line}")
+        return 1
+    print("\nRound-trip and range checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
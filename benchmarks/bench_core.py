@@ -0,0 +1,231 @@
+"""
+Microbenchmarks for the core library hot paths:
+
+- PuzzleGenerator.generate, per difficulty
+- PerformanceTracker.log_attempt, recent_correctness and the summary
+  properties, at history sizes from 10 to 1M attempts
+- AdaptiveEngine.update_level
+
+Reports ops/sec and, via tracemalloc, two memory figures: the bytes
+held by the case's setup and the peak allocated by one call on top of
+that. Results can be saved as a JSON baseline and later runs compared
+against it; the script exits with status 1 if anything got slower, or
+its per-call peak bigger, than the threshold allows.
+
+Run from the project root:
+    python benchmarks/bench_core.py --save benchmarks/baseline.json
+    python benchmarks/bench_core.py --baseline benchmarks/baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.adaptive_engine import AdaptiveEngine  # noqa: E402
+from src.puzzle_generator import PuzzleGenerator  # noqa: E402
+from src.tracker import PerformanceTracker  # noqa: E402
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+
+# Memory figures below this are noise, not regressions
+MEMORY_FLOOR = 64 * 1024
+
+
+def build_tracker(size: int) -> PerformanceTracker:
+    rng = random.Random(size)
+    tracker = PerformanceTracker()
+    for i in range(size):
+        correct = rng.random() < 0.7
+        tracker.log_attempt(
+            question=f"{i % 10} + {i % 7}",
+            correct_answer=i % 10 + i % 7,
+            user_answer=None if i % 11 == 0 else i % 10 + i % 7 + (0 if correct else 1),
+            correct=correct,
+            time_taken=rng.random() * 10,
+            difficulty=("easy", "medium", "hard")[i % 3],
+        )
+    return tracker
+
+
+# ---------- Cases ----------
+# Each case is (name, setup); setup() builds any state and returns the
+# zero-argument callable to time.
+
+def generator_cases() -> List[Tuple[str, Callable]]:
+    cases = []
+    for difficulty in ("easy", "medium", "hard"):
+        def setup(difficulty=difficulty):
+            generator = PuzzleGenerator()
+            return lambda: generator.generate(difficulty)
+        cases.append((f"generator.generate[{difficulty}]", setup))
+    return cases
+
+
+def tracker_cases(sizes: List[int]) -> List[Tuple[str, Callable]]:
+    cases = []
+    for size in sizes:
+        def log_attempt(size=size):
+            tracker = build_tracker(size)
+
+            def run():
+                # Truncate back to `size` rows so every call appends to a
+                # history of exactly that length, however long the timing runs
+                tracker._size = size
+                tracker.log_attempt("1 + 1", 2, 2, True, 1.0, "easy")
+
+            return run
+
+        def recent(size=size):
+            tracker = build_tracker(size)
+            return lambda: tracker.recent_correctness(n=5)
+
+        def summary(size=size):
+            tracker = build_tracker(size)
+
+            def run():
+                tracker.total_attempts
+                tracker.num_correct
+                tracker.num_incorrect
+                tracker.accuracy
+                tracker.average_time
+
+            return run
+
+        cases.append((f"tracker.log_attempt[n={size}]", log_attempt))
+        cases.append((f"tracker.recent_correctness[n={size}]", recent))
+        cases.append((f"tracker.summary_properties[n={size}]", summary))
+    return cases
+
+
+def engine_cases() -> List[Tuple[str, Callable]]:
+    def setup():
+        engine = AdaptiveEngine()
+        windows = [[True] * 5, [True, False, True, False, False], [False] * 5, [True] * 3 + [False] * 2]
+        state = {"i": 0}
+
+        def run():
+            state["i"] += 1
+            engine.update_level(windows[state["i"] % len(windows)])
+
+        return run
+
+    return [("engine.update_level", setup)]
+
+
+# ---------- Measuring ----------
+
+def measure(setup: Callable, min_time: float, repeats: int) -> Dict:
+    tracemalloc.start()
+    fn = setup()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Grow the batch until it takes long enough to time reliably
+    batch = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(batch):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeats:
+            break
+        batch *= 2
+
+    best = elapsed
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(batch):
+            fn()
+        best = min(best, time.perf_counter() - start)
+
+    return {"ops_per_sec": batch / best, "held_bytes": held, "peak_bytes": max(peak - held, 0)}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Return a description of every regression past `threshold`."""
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+
+        if current["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {current['ops_per_sec']:,.0f} ops/s vs baseline {base['ops_per_sec']:,.0f}"
+            )
+        # Setup size is reported but not gated; the per-call peak is what a change to the code moves
+        if "peak_bytes" not in base:
+            continue
+        if (
+            max(current["peak_bytes"], base["peak_bytes"]) > MEMORY_FLOOR
+            and current["peak_bytes"] > base["peak_bytes"] * (1 + threshold)
+        ):
+            regressions.append(
+                f"{name}: peak {current['peak_bytes']:,} bytes per call vs baseline {base['peak_bytes']:,}"
+            )
+    return regressions
+
+
+def parse_ints(raw: str) -> List[int]:
+    return [int(x) for x in raw.split(",")]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the core library hot paths.")
+    parser.add_argument("--sizes", type=parse_ints, default=DEFAULT_SIZES, help="tracker history sizes")
+    parser.add_argument("--min-time", type=float, default=0.3, help="seconds of timing per case")
+    parser.add_argument("--repeats", type=int, default=5, help="timed batches per case; best is kept")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, e.g. 0.25 = 25%%")
+    args = parser.parse_args()
+
+    cases = generator_cases() + tracker_cases(args.sizes) + engine_cases()
+    cases = [(name, setup) for name, setup in cases if args.filter in name]
+
+    results: Dict[str, Dict] = {}
+    print(f"{'case':<42} {'ops/sec':>14} {'held':>14} {'peak/call':>14}")
+    for name, setup in cases:
+        result = measure(setup, args.min_time, args.repeats)
+        results[name] = result
+        print(
+            f"{name:<42} {result['ops_per_sec']:>14,.0f}"
+            f" {result['held_bytes'] / 1024:>10,.1f} KiB {result['peak_bytes'] / 1024:>10,.1f} KiB"
+        )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                f,
+                indent=2,
+            )
+        print(f"\nSaved results to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions past {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions past {args.threshold:.0%} against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
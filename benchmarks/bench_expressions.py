@@ -0,0 +1,42 @@
+"""
+Benchmark for PuzzleGenerator.generate_expression.
+
+Expressions are built backwards from the answer, so there is no
+generate-and-reject loop: the time per operation should stay flat as
+the number of operations grows.
+
+Run from the project root:
+    python benchmarks/bench_expressions.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.puzzle_generator import PuzzleGenerator  # noqa: E402
+
+
+def time_expressions(generator: PuzzleGenerator, difficulty: str, num_ops: int, repeats: int) -> float:
+    """Return the average seconds per puzzle."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        generator.generate_expression(difficulty, num_ops=num_ops)
+    return (time.perf_counter() - start) / repeats
+
+
+def main(repeats: int = 2000) -> None:
+    generator = PuzzleGenerator()
+
+    print(f"{'difficulty':<10} {'ops':>4} {'µs/puzzle':>11} {'µs/op':>8}")
+    for difficulty in ("easy", "medium", "hard"):
+        for num_ops in (1, 2, 4, 8, 16, 32):
+            per_puzzle = time_expressions(generator, difficulty, num_ops, repeats)
+            print(
+                f"{difficulty:<10} {num_ops:>4} "
+                f"{per_puzzle * 1e6:>11.1f} {per_puzzle * 1e6 / num_ops:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+import json
+import mmap
+import re
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Package import for the app; plain import when run from src/ like main.py
+try:
+    from .tracker import Attempt
+except ImportError:
+    from tracker import Attempt
+
+
+# File layout:
+#
+#   MAGIC
+#   block 0, block 1, ...            column blocks (see _write_block)
+#   dictionaries (JSON)              learners, difficulties
+#   block index (numpy records)      one INDEX_DTYPE row per block
+#   trailer                          offsets of the above + MAGIC
+#
+# Each block holds up to `block_rows` attempts of a single learner. The index
+# keeps per-block counts, so whole-learner aggregates never touch block data.
+
+MAGIC = b"MADVARC1"
+TRAILER = struct.Struct("<QQQ8s")  # dictionaries offset, index offset, block count, magic
+BLOCK_HEADER = struct.Struct("<IIIII")  # byte lengths of the four varint sections + expression text
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("learner", "<u4"),
+        ("first_row", "<u8"),  # position of the block's first attempt in the learner's history
+        ("rows", "<u4"),
+        ("offset", "<u8"),
+        ("length", "<u4"),
+        ("num_correct", "<u4"),
+        ("total_time", "<f8"),
+    ]
+)
+
+# Questions like "12 + 7" are stored as an op code plus two operands;
+# anything else (multi-step expressions, nearly all unique) is stored as
+# UTF-8 text in its own block, so it is only decoded with that block.
+OPS = ["+", "-", "×", "÷", "expression"]
+EXPRESSION_OP = OPS.index("expression")
+_BINARY_QUESTION = re.compile(r"^(\d+) ([+\-×÷]) (\d+)$")
+
+
+# ---------- Varints ----------
+
+def _zigzag(n: int) -> int:
+    return (n << 1) if n >= 0 else ((-n << 1) - 1)
+
+
+def _unzigzag(n: int) -> int:
+    return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+
+
+def _write_varints(values: Iterable[int], out: bytearray) -> None:
+    """Append unsigned LEB128 varints."""
+    for v in values:
+        while v >= 0x80:
+            out.append((v & 0x7F) | 0x80)
+            v >>= 7
+        out.append(v)
+
+
+def _read_varints(buf, count: int) -> List[int]:
+    values = []
+    pos = 0
+    for _ in range(count):
+        shift = 0
+        v = 0
+        while True:
+            byte = buf[pos]
+            pos += 1
+            v |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values.append(v)
+    return values
+
+
+# ---------- Writing ----------
+
+class ArchiveWriter:
+    """
+    Writes attempt history to a compact columnar archive.
+
+    Usage:
+        with ArchiveWriter("history.mada") as writer:
+            writer.add("Sam", tracker.attempts)
+    """
+
+    def __init__(self, path: str, block_rows: int = 4096) -> None:
+        self.block_rows = block_rows
+
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._offset = len(MAGIC)
+
+        self._learners: Dict[str, int] = {}
+        self._learner_rows: List[int] = []
+        self._difficulties: Dict[str, int] = {}
+        self._index: List[Tuple] = []
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def _code(dictionary: Dict[str, int], value: str) -> int:
+        code = dictionary.get(value)
+        if code is None:
+            code = dictionary[value] = len(dictionary)
+        return code
+
+    def add(self, learner: str, attempts: Iterable[Attempt]) -> None:
+        """Append `attempts` to `learner`'s history (can be called repeatedly)."""
+        learner_id = self._code(self._learners, learner)
+        if learner_id == len(self._learner_rows):
+            self._learner_rows.append(0)
+
+        batch: List[Attempt] = []
+        for attempt in attempts:
+            batch.append(attempt)
+            if len(batch) == self.block_rows:
+                self._write_block(learner_id, batch)
+                batch = []
+        if batch:
+            self._write_block(learner_id, batch)
+
+    def _write_block(self, learner_id: int, attempts: List[Attempt]) -> None:
+        n = len(attempts)
+        correct = np.fromiter((a.correct for a in attempts), dtype=np.bool_, count=n)
+        no_answer = np.fromiter((a.user_answer is None for a in attempts), dtype=np.bool_, count=n)
+        times = np.fromiter((a.time_taken for a in attempts), dtype="<f4", count=n)
+        difficulty = np.fromiter(
+            (self._code(self._difficulties, a.difficulty) for a in attempts), dtype=np.uint8, count=n
+        )
+
+        ops = np.empty(n, dtype=np.uint8)
+        operands: List[int] = []
+        expressions: List[bytes] = []
+        for i, a in enumerate(attempts):
+            match = _BINARY_QUESTION.match(a.question)
+            if match:
+                ops[i] = OPS.index(match.group(2))
+                operands.append(int(match.group(1)))
+                operands.append(int(match.group(3)))
+            else:
+                ops[i] = EXPRESSION_OP
+                expressions.append(a.question.encode("utf-8"))
+
+        # Correct answers as deltas from the previous row; user answers as
+        # the (usually small) distance from the correct one.
+        answer_deltas = []
+        previous = 0
+        for a in attempts:
+            answer_deltas.append(_zigzag(a.correct_answer - previous))
+            previous = a.correct_answer
+        user_deltas = [
+            _zigzag(a.user_answer - a.correct_answer) for a in attempts if a.user_answer is not None
+        ]
+
+        sections = []
+        expression_lengths = [len(text) for text in expressions]
+        for values in (answer_deltas, user_deltas, operands, expression_lengths):
+            section = bytearray()
+            _write_varints(values, section)
+            sections.append(bytes(section))
+        sections.append(b"".join(expressions))
+
+        block = b"".join(
+            [
+                BLOCK_HEADER.pack(*(len(s) for s in sections)),
+                times.tobytes(),
+                np.packbits(correct).tobytes(),
+                np.packbits(no_answer).tobytes(),
+                difficulty.tobytes(),
+                ops.tobytes(),
+                *sections,
+            ]
+        )
+        self._file.write(block)
+
+        self._index.append(
+            (
+                learner_id,
+                self._learner_rows[learner_id],
+                n,
+                self._offset,
+                len(block),
+                int(np.count_nonzero(correct)),
+                float(times.sum(dtype=np.float64)),
+            )
+        )
+        self._learner_rows[learner_id] += n
+        self._offset += len(block)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+
+        dictionaries = json.dumps(
+            {
+                "learners": list(self._learners),
+                "difficulties": list(self._difficulties),
+            }
+        ).encode("utf-8")
+        index = np.array(self._index, dtype=INDEX_DTYPE).tobytes()
+
+        dictionaries_offset = self._offset
+        index_offset = dictionaries_offset + len(dictionaries)
+        self._file.write(dictionaries)
+        self._file.write(index)
+        self._file.write(TRAILER.pack(dictionaries_offset, index_offset, len(self._index), MAGIC))
+        self._file.close()
+
+
+# ---------- Reading ----------
+
+class ArchiveReader:
+    """
+    Memory-mapped reader for archives written by `ArchiveWriter`.
+
+    Opening only parses the trailer, dictionaries and block index.
+    Whole-learner summaries come from the index alone; range summaries
+    decode just the correctness bits and times of the blocks at the edges
+    of the range. Full rows are decoded only by `attempts()`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a Math Adventures archive: {path}")
+        dictionaries_offset, index_offset, num_blocks, magic = TRAILER.unpack_from(
+            self._mm, len(self._mm) - TRAILER.size
+        )
+        if magic != MAGIC:
+            raise ValueError(f"Truncated or corrupt archive: {path}")
+
+        dictionaries = json.loads(self._mm[dictionaries_offset:index_offset].decode("utf-8"))
+        self.learners: List[str] = dictionaries["learners"]
+        self.difficulties: List[str] = dictionaries["difficulties"]
+        self._learner_ids = {name: i for i, name in enumerate(self.learners)}
+
+        # A small in-memory copy (one row per block), so callers holding
+        # `index` never pin the map and close() always succeeds
+        self.index = np.frombuffer(
+            self._mm, dtype=INDEX_DTYPE, count=num_blocks, offset=index_offset
+        ).copy()
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def _blocks_for(self, learner: str) -> np.ndarray:
+        learner_id = self._learner_ids.get(learner)
+        if learner_id is None:
+            return self.index[:0]
+        return self.index[self.index["learner"] == learner_id]
+
+    def _correct_and_times(self, entry) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode only the correctness bits and float32 times of a block."""
+        n = int(entry["rows"])
+        start = int(entry["offset"]) + BLOCK_HEADER.size
+        times = np.frombuffer(self._mm, dtype="<f4", count=n, offset=start)
+        bits = np.frombuffer(self._mm, dtype=np.uint8, count=(n + 7) // 8, offset=start + 4 * n)
+        correct = np.unpackbits(bits, count=n).astype(np.bool_)
+        return correct, times
+
+    @staticmethod
+    def _summary(total: int, correct: int, time_sum: float) -> Dict:
+        return {
+            "total_attempts": total,
+            "num_correct": correct,
+            "num_incorrect": total - correct,
+            "accuracy": correct / total if total else 0.0,
+            "average_time": time_sum / total if total else 0.0,
+        }
+
+    def summary(self, learner: Optional[str] = None) -> Dict:
+        """Aggregates for one learner (or everyone), read from the block index only."""
+        blocks = self.index if learner is None else self._blocks_for(learner)
+        return self._summary(
+            int(blocks["rows"].sum()),
+            int(blocks["num_correct"].sum()),
+            float(blocks["total_time"].sum()),
+        )
+
+    def range_summary(self, learner: str, start: int, stop: int) -> Dict:
+        """Aggregates for attempts [start, stop) of a learner's history."""
+        total = correct = 0
+        time_sum = 0.0
+
+        for entry in self._blocks_for(learner):
+            first = int(entry["first_row"])
+            last = first + int(entry["rows"])
+            if last <= start or first >= stop:
+                continue
+
+            if start <= first and last <= stop:
+                total += int(entry["rows"])
+                correct += int(entry["num_correct"])
+                time_sum += float(entry["total_time"])
+            else:
+                lo = max(start, first) - first
+                hi = min(stop, last) - first
+                block_correct, block_times = self._correct_and_times(entry)
+                total += hi - lo
+                correct += int(np.count_nonzero(block_correct[lo:hi]))
+                time_sum += float(block_times[lo:hi].sum(dtype=np.float64))
+
+        return self._summary(total, correct, time_sum)
+
+    def _decode_block(self, entry) -> List[Attempt]:
+        n = int(entry["rows"])
+        pos = int(entry["offset"])
+        lengths = BLOCK_HEADER.unpack_from(self._mm, pos)
+        pos += BLOCK_HEADER.size
+
+        correct, times = self._correct_and_times(entry)
+        pos += 4 * n + (n + 7) // 8
+        no_answer = np.unpackbits(
+            np.frombuffer(self._mm, dtype=np.uint8, count=(n + 7) // 8, offset=pos), count=n
+        ).astype(np.bool_)
+        pos += (n + 7) // 8
+        difficulty = np.frombuffer(self._mm, dtype=np.uint8, count=n, offset=pos)
+        pos += n
+        ops = np.frombuffer(self._mm, dtype=np.uint8, count=n, offset=pos)
+        pos += n
+
+        num_expressions = int(np.count_nonzero(ops == EXPRESSION_OP))
+        counts = (n, n - int(np.count_nonzero(no_answer)), 2 * (n - num_expressions), num_expressions)
+        sections = []
+        for length, count in zip(lengths, counts):
+            sections.append(_read_varints(self._mm[pos : pos + length], count))
+            pos += length
+        answer_deltas, user_deltas, operands, expression_lengths = sections
+
+        expressions = []
+        for length in expression_lengths:
+            expressions.append(self._mm[pos : pos + length].decode("utf-8"))
+            pos += length
+
+        attempts = []
+        correct_answer = 0
+        next_user = next_operand = next_expression = 0
+        for i in range(n):
+            correct_answer += _unzigzag(answer_deltas[i])
+
+            user_answer = None
+            if not no_answer[i]:
+                user_answer = correct_answer + _unzigzag(user_deltas[next_user])
+                next_user += 1
+
+            if ops[i] == EXPRESSION_OP:
+                question = expressions[next_expression]
+                next_expression += 1
+            else:
+                a, b = operands[next_operand], operands[next_operand + 1]
+                question = f"{a} {OPS[ops[i]]} {b}"
+                next_operand += 2
+
+            attempts.append(
+                Attempt(
+                    question=question,
+                    correct_answer=correct_answer,
+                    user_answer=user_answer,
+                    correct=bool(correct[i]),
+                    time_taken=float(times[i]),
+                    difficulty=self.difficulties[difficulty[i]],
+                )
+            )
+        return attempts
+
+    def attempts(self, learner: str, start: int = 0, stop: Optional[int] = None) -> List[Attempt]:
+        """Decode attempts [start, stop) of a learner's history."""
+        result: List[Attempt] = []
+        for entry in self._blocks_for(learner):
+            first = int(entry["first_row"])
+            last = first + int(entry["rows"])
+            if last <= start or (stop is not None and first >= stop):
+                continue
+            lo = max(start, first) - first
+            hi = (last if stop is None else min(stop, last)) - first
+            result.extend(self._decode_block(entry)[lo:hi])
+        return result
@@ -0,0 +1,160 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Package import for the app; plain import when run from src/ like main.py
+try:
+    from .tracker import PerformanceTracker
+except ImportError:
+    from tracker import PerformanceTracker
+
+
+@dataclass
+class LearnerProfile:
+    name: str
+    recommended_level: str = "easy"
+    recent_results: List[bool] = field(default_factory=list)
+    total_attempts: int = 0
+    total_correct: int = 0
+    total_time: float = 0.0
+
+    @property
+    def accuracy(self) -> float:
+        if not self.total_attempts:
+            return 0.0
+        return self.total_correct / self.total_attempts
+
+
+class ProfileStore:
+    """
+    Remembers returning learners between sessions.
+
+    Profiles are keyed by learner name (case-insensitive). Recently used
+    profiles are kept in a bounded in-memory LRU; every profile is also
+    written through to a local SQLite table keyed by that name, so cold
+    ones survive eviction and restarts. A cache hit is a dict lookup and
+    a miss is a single primary-key lookup.
+    """
+
+    def __init__(self, path: str, capacity: int = 1024, recent_size: int = 10) -> None:
+        self.path = path
+        self.capacity = capacity
+        self.recent_size = recent_size
+
+        self._cache: "OrderedDict[str, LearnerProfile]" = OrderedDict()
+        self._lock = threading.Lock()  # Streamlit serves sessions from several threads
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One connection for the store's lifetime, only used under _lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                recommended_level TEXT NOT NULL,
+                recent_results TEXT NOT NULL,
+                total_attempts INTEGER NOT NULL,
+                total_correct INTEGER NOT NULL,
+                total_time REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return name.strip().lower()
+
+    def _remember(self, key: str, profile: LearnerProfile) -> None:
+        self._cache[key] = profile
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+
+    def _get(self, key: str) -> Optional[LearnerProfile]:
+        """Cache, then table lookup. Caller holds _lock."""
+        profile = self._cache.get(key)
+        if profile is not None:
+            self._cache.move_to_end(key)
+            return profile
+
+        row = self._db.execute(
+            "SELECT name, recommended_level, recent_results, total_attempts, total_correct, total_time "
+            "FROM profiles WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        name, level, recent, attempts, correct, total_time = row
+        profile = LearnerProfile(
+            name=name,
+            recommended_level=level,
+            recent_results=json.loads(recent),
+            total_attempts=attempts,
+            total_correct=correct,
+            total_time=total_time,
+        )
+        self._remember(key, profile)
+        return profile
+
+    def _put(self, key: str, profile: LearnerProfile) -> None:
+        """Write through to the table, then cache. Caller holds _lock."""
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    profile.name,
+                    profile.recommended_level,
+                    json.dumps(profile.recent_results),
+                    profile.total_attempts,
+                    profile.total_correct,
+                    profile.total_time,
+                ),
+            )
+        self._remember(key, profile)
+
+    def get(self, name: str) -> Optional[LearnerProfile]:
+        """Return the stored profile for `name`, or None for a new learner."""
+        with self._lock:
+            return self._get(self._key(name))
+
+    def put(self, profile: LearnerProfile) -> None:
+        with self._lock:
+            self._put(self._key(profile.name), profile)
+
+    def record_session(self, name: str, tracker: PerformanceTracker, level: str) -> LearnerProfile:
+        """
+        Fold a finished session into the learner's profile and save it.
+
+        The read-modify-write happens under one lock, so two sessions for
+        the same learner cannot overwrite each other's update.
+        """
+        key = self._key(name)
+        with self._lock:
+            profile = self._get(key) or LearnerProfile(name=name)
+
+            recent = profile.recent_results + tracker.recent_correctness(n=self.recent_size)
+            updated = LearnerProfile(
+                name=profile.name,
+                recommended_level=level,
+                recent_results=recent[-self.recent_size:],
+                total_attempts=profile.total_attempts + tracker.total_attempts,
+                total_correct=profile.total_correct + tracker.num_correct,
+                total_time=profile.total_time + tracker.total_time,
+            )
+            self._put(key, updated)
+            return updated
@@ -1,6 +1,6 @@
 import random
 from dataclasses import dataclass
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 
 @dataclass
@@ -23,14 +23,20 @@ class PuzzleGenerator:
             "easy": {
                 "range": (0, 10),
                 "operations": ["+", "-"],
+                "expression_ops": 2,
+                "expression_rate": 0.0,
             },
             "medium": {
                 "range": (0, 20),
                 "operations": ["+", "-", "*"],
+                "expression_ops": 2,
+                "expression_rate": 0.0,
             },
             "hard": {
                 "range": (1, 50),  # start from 1 for safer division
                 "operations": ["+", "-", "*", "/"],
+                "expression_ops": 3,
+                "expression_rate": 0.5,  # half of hard puzzles are multi-step
             },
         }
 
@@ -40,6 +46,70 @@ class PuzzleGenerator:
     def _get_operations(self, difficulty: str) -> List[str]:
         return self.difficulty_settings[difficulty]["operations"]
 
+    def _build_expression(
+        self, value: int, num_ops: int, operations: List[str], lo: int, hi: int
+    ) -> Tuple[str, bool]:
+        """
+        Build an expression string that evaluates to `value`.
+
+        Works backwards: pick an operation, split `value` into two operands
+        that produce it, then recurse into them. Every sub-expression stays
+        a whole number in [lo, hi], so nothing has to be thrown away and
+        retried. Returns (text, is_compound).
+        """
+        if num_ops == 0:
+            return str(value), False
+
+        # Smallest operand for "+" and "-", so there is no "+ 0" or "- 0" step
+        least = max(lo, 1)
+
+        # Divisors other than 1 and `value`, so "×" never needs a 1 operand
+        divisors = [d for d in range(2, int(value ** 0.5) + 1) if value % d == 0]
+
+        # Not every operation can split every value without a trivial
+        # (0 or 1) operand; choose among the ones that can
+        feasible = [
+            op for op in operations
+            if (op != "+" or value >= 2 * least)
+            and (op != "-" or hi - value >= least)
+            and (op != "*" or (value > 0 and divisors))
+            and (op != "/" or (value > 0 and hi // value >= 2))
+        ]
+        op = random.choice(feasible or operations)
+
+        if op == "+":
+            a = random.randint(least, value - least)
+            b = value - a
+        elif op == "-":
+            b = random.randint(least, hi - value)
+            a = value + b
+        elif op == "*":
+            a = random.choice(divisors)
+            b = value // a
+            if random.random() < 0.5:
+                a, b = b, a
+        elif op == "/":
+            b = random.randint(2, hi // value)
+            a = value * b
+        else:
+            raise ValueError(f"Unsupported operation: {op}")
+
+        # Share the remaining operations between the two operands
+        left_ops = random.randint(0, num_ops - 1)
+        left, left_compound = self._build_expression(a, left_ops, operations, lo, hi)
+        right, right_compound = self._build_expression(b, num_ops - 1 - left_ops, operations, lo, hi)
+
+        if op in ("*", "/"):
+            if left_compound:
+                left = f"({left})"
+            if right_compound:
+                right = f"({right})"
+        elif op == "-" and right_compound:
+            right = f"({right})"
+
+        symbol = {"+": "+", "-": "-", "*": "×", "/": "÷"}[op]
+        return f"{left} {symbol} {right}", True
+
     def generate(self, difficulty: str) -> Puzzle:
         """
         Generate a single puzzle at the given difficulty level.
@@ -48,6 +118,9 @@ class PuzzleGenerator:
         if difficulty not in self.difficulty_settings:
             raise ValueError(f"Unknown difficulty: {difficulty}")
 
+        if random.random() < self.difficulty_settings[difficulty]["expression_rate"]:
+            return self.generate_expression(difficulty)
+
         num_range = self._get_range(difficulty)
         operations = self._get_operations(difficulty)
         op = random.choice(operations)
@@ -80,3 +153,31 @@ class PuzzleGenerator:
             difficulty=difficulty,
             operation=op,
         )
+
+    def generate_expression(self, difficulty: str, num_ops: Optional[int] = None) -> Puzzle:
+        """
+        Generate a multi-step puzzle such as `(3 + 5) × 2 - 4`.
+
+        The answer is picked first and the expression is built backwards
+        from it, so every intermediate result is a non-negative integer
+        and the cost per puzzle only grows with `num_ops`.
+        """
+        difficulty = difficulty.lower()
+        if difficulty not in self.difficulty_settings:
+            raise ValueError(f"Unknown difficulty: {difficulty}")
+
+        if num_ops is None:
+            num_ops = self.difficulty_settings[difficulty]["expression_ops"]
+
+        lo, hi = self._get_range(difficulty)
+        operations = self._get_operations(difficulty)
+
+        answer = random.randint(lo, hi)
+        question, _ = self._build_expression(answer, num_ops, operations, lo, hi)
+
+        return Puzzle(
+            question=question,
+            answer=answer,
+            difficulty=difficulty,
+            operation="expression",
+        )
@@ -0,0 +1,124 @@
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Package import for the app; plain import when run from src/ like main.py
+try:
+    from .tracker import Attempt
+except ImportError:
+    from tracker import Attempt
+
+
+@dataclass
+class ReviewItem:
+    question: str
+    answer: int
+    difficulty: str
+    interval: int
+    due: int
+    lapses: int = 0  # times missed again on review
+
+
+class ReviewScheduler:
+    """
+    Spaced-repetition queue for missed questions.
+
+    Each wrong attempt is scheduled to come back a few questions later.
+    Items live in a min-heap keyed by the question index they are due at:
+
+    - Answered correctly on review → interval grows (× growth)
+    - Answered wrong again → interval resets to initial_interval, but the
+      next showing is pushed back further with each repeated miss
+    - Interval grows past max_interval → item is retired
+
+    At most one review is served every `review_gap` questions, so fresh
+    puzzles keep coming even when several reviews are due.
+
+    Scheduling and picking the next due item are both O(log n).
+    """
+
+    def __init__(
+        self,
+        initial_interval: int = 2,
+        growth: int = 2,
+        max_interval: int = 16,
+        review_gap: int = 2,
+    ) -> None:
+        self.initial_interval = initial_interval
+        self.growth = growth
+        self.max_interval = max_interval
+        self.review_gap = review_gap
+
+        self._heap: List[Tuple[int, int, str]] = []
+        self._items: Dict[str, ReviewItem] = {}
+        self._counter = 0  # tie-breaker so equal due dates stay FIFO
+        self._last_review: Optional[int] = None  # question index of the last review served
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _push(self, item: ReviewItem) -> None:
+        self._counter += 1
+        heapq.heappush(self._heap, (item.due, self._counter, item.question))
+
+    def record_attempt(self, attempt: Attempt, question_index: int) -> None:
+        """
+        Update the schedule from a logged `Attempt`.
+
+        New mistakes are added, reviewed questions have their interval
+        grown or reset, and correct answers to fresh questions are ignored.
+        """
+        item = self._items.get(attempt.question)
+
+        if item is None:
+            if attempt.correct:
+                return
+            item = ReviewItem(
+                question=attempt.question,
+                answer=attempt.correct_answer,
+                difficulty=attempt.difficulty,
+                interval=self.initial_interval,
+                due=question_index + self.initial_interval,
+            )
+            self._items[item.question] = item
+            self._push(item)
+            return
+
+        if attempt.correct:
+            item.interval *= self.growth
+            if item.interval > self.max_interval:
+                del self._items[item.question]
+                return
+            item.due = question_index + item.interval
+        else:
+            item.interval = self.initial_interval
+            item.lapses += 1
+            item.due = question_index + min(self.initial_interval * (1 + item.lapses), self.max_interval)
+
+        self._push(item)
+
+    def pop_due(self, question_index: int) -> Optional[ReviewItem]:
+        """
+        Return the most overdue item due at or before `question_index`,
+        or None if nothing is due yet or a review was served within the
+        last `review_gap` questions.
+
+        The item stays tracked until its next `record_attempt`.
+        """
+        if self._last_review is not None and question_index - self._last_review < self.review_gap:
+            return None
+
+        while self._heap and self._heap[0][0] <= question_index:
+            due, _, question = heapq.heappop(self._heap)
+            item = self._items.get(question)
+
+            # Skip entries left behind by a reschedule or retirement
+            if item is None or item.due != due:
+                continue
+
+            # Mark as in flight so a duplicate heap entry can't serve it twice
+            item.due = -1
+            self._last_review = question_index
+            return item
+
+        return None
@@ -1,6 +1,12 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import List, Optional
-from statistics import mean
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Answers are stored as int64
+ANSWER_MIN = int(np.iinfo(np.int64).min)
+ANSWER_MAX = int(np.iinfo(np.int64).max)
 
 
 @dataclass
@@ -13,14 +19,65 @@ class Attempt:
     difficulty: str
 
 
+class _AttemptView(Sequence):
+    """Read-only list-like view that builds `Attempt` objects on access."""
+
+    def __init__(self, tracker: "PerformanceTracker") -> None:
+        self._tracker = tracker
+
+    def __len__(self) -> int:
+        return self._tracker._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._tracker._attempt_at(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("attempt index out of range")
+        return self._tracker._attempt_at(index)
+
+
 class PerformanceTracker:
     """
     Tracks learner performance across the session:
     correctness, time taken, and difficulty.
+
+    Attempts are stored column by column in growable numpy buffers, so
+    summaries are vectorised and `to_frame()` / `to_arrow()` can hand out
+    views of the data without copying it.
     """
 
+    _INITIAL_CAPACITY = 64
+
     def __init__(self) -> None:
-        self.attempts: List[Attempt] = []
+        self._size = 0
+        self._difficulty_codes: Dict[str, int] = {}
+        self._difficulties: List[str] = []
+        self._allocate(self._INITIAL_CAPACITY)
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Move the columns into fresh buffers of `capacity` rows.
+
+        Frames handed out earlier keep pointing at the old buffers,
+        which stay valid, so growing never invalidates a view.
+        """
+        n = self._size
+        old = getattr(self, "_columns", None)
+        columns = {
+            "question": np.empty(capacity, dtype=object),
+            "correct_answer": np.zeros(capacity, dtype=np.int64),
+            "user_answer": np.zeros(capacity, dtype=np.int64),
+            "no_answer": np.zeros(capacity, dtype=np.bool_),
+            "correct": np.zeros(capacity, dtype=np.bool_),
+            "time_taken": np.zeros(capacity, dtype=np.float64),
+            "difficulty": np.zeros(capacity, dtype=np.int8),
+        }
+        if old is not None:
+            for name, column in columns.items():
+                column[:n] = old[name][:n]
+        self._columns = columns
 
     def log_attempt(
         self,
@@ -31,46 +88,138 @@ class PerformanceTracker:
         time_taken: float,
         difficulty: str,
     ) -> None:
-        self.attempts.append(
-            Attempt(
-                question=question,
-                correct_answer=correct_answer,
-                user_answer=user_answer,
-                correct=correct,
-                time_taken=time_taken,
-                difficulty=difficulty,
-            )
+        # Validate before touching any column so a bad call leaves no partial row
+        for label, value in (("correct_answer", correct_answer), ("user_answer", user_answer)):
+            if value is not None and not ANSWER_MIN <= value <= ANSWER_MAX:
+                raise ValueError(f"{label} out of range for int64: {value}")
+
+        i = self._size
+        if i == len(self._columns["correct"]):
+            self._allocate(2 * i)
+
+        code = self._difficulty_codes.get(difficulty)
+        if code is None:
+            code = len(self._difficulties)
+            self._difficulty_codes[difficulty] = code
+            self._difficulties.append(difficulty)
+
+        columns = self._columns
+        columns["question"][i] = question
+        columns["correct_answer"][i] = correct_answer
+        columns["user_answer"][i] = 0 if user_answer is None else user_answer
+        columns["no_answer"][i] = user_answer is None
+        columns["correct"][i] = correct
+        columns["time_taken"][i] = time_taken
+        columns["difficulty"][i] = code
+        self._size = i + 1
+
+    def _column(self, name: str) -> np.ndarray:
+        """View of the filled part of a column."""
+        return self._columns[name][: self._size]
+
+    def _attempt_at(self, i: int) -> Attempt:
+        columns = self._columns
+        return Attempt(
+            question=columns["question"][i],
+            correct_answer=int(columns["correct_answer"][i]),
+            user_answer=None if columns["no_answer"][i] else int(columns["user_answer"][i]),
+            correct=bool(columns["correct"][i]),
+            time_taken=float(columns["time_taken"][i]),
+            difficulty=self._difficulties[columns["difficulty"][i]],
         )
 
+    @property
+    def attempts(self) -> Sequence:
+        """All attempts so far, oldest first, as `Attempt` objects."""
+        return _AttemptView(self)
+
     # ---------- Summary Properties ----------
 
     @property
     def total_attempts(self) -> int:
-        return len(self.attempts)
+        return self._size
 
     @property
     def num_correct(self) -> int:
-        return sum(1 for a in self.attempts if a.correct)
+        return int(np.count_nonzero(self._column("correct")))
 
     @property
     def num_incorrect(self) -> int:
-        return sum(1 for a in self.attempts if not a.correct)
+        return self.total_attempts - self.num_correct
 
     @property
     def accuracy(self) -> float:
-        if not self.attempts:
+        if not self._size:
             return 0.0
         return self.num_correct / self.total_attempts
 
     @property
     def average_time(self) -> float:
-        if not self.attempts:
+        if not self._size:
             return 0.0
-        return mean(a.time_taken for a in self.attempts)
+        return float(self._column("time_taken").mean())
+
+    @property
+    def total_time(self) -> float:
+        return float(self._column("time_taken").sum())
 
     def recent_correctness(self, n: int = 5) -> List[bool]:
         """
         Returns a list of correctness values (True/False)
         for the last `n` attempts.
         """
-        return [a.correct for a in self.attempts[-n:]]
+        if n <= 0:
+            return []
+        return self._column("correct")[-n:].tolist()
+
+    # ---------- Tabular Views ----------
+
+    def to_frame(self):
+        """
+        Attempt history as a pandas DataFrame.
+
+        Numeric columns are views of the tracker's buffers (no per-row
+        copy); `user_answer` is a nullable Int64 column and `difficulty`
+        a categorical built from the stored codes. Treat the frame as
+        read-only: writing to it writes to the tracker.
+        """
+        import pandas as pd
+
+        data = {
+            "question": self._column("question"),
+            "correct_answer": self._column("correct_answer"),
+            "user_answer": pd.arrays.IntegerArray(
+                self._column("user_answer"), self._column("no_answer")
+            ),
+            "correct": self._column("correct"),
+            "time_taken": self._column("time_taken"),
+            "difficulty": pd.Categorical.from_codes(
+                self._column("difficulty"), categories=list(self._difficulties)
+            ),
+        }
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """
+        Attempt history as a pyarrow Table.
+
+        Integer and float columns wrap the tracker's buffers directly;
+        `difficulty` is dictionary-encoded from the stored codes.
+        """
+        import pyarrow as pa
+
+        return pa.table(
+            {
+                "question": pa.array(self._column("question"), type=pa.string()),
+                "correct_answer": pa.array(self._column("correct_answer")),
+                "user_answer": pa.array(
+                    self._column("user_answer"), mask=self._column("no_answer")
+                ),
+                "correct": pa.array(self._column("correct")),
+                "time_taken": pa.array(self._column("time_taken")),
+                "difficulty": pa.DictionaryArray.from_arrays(
+                    pa.array(self._column("difficulty")),
+                    pa.array(self._difficulties, type=pa.string()),
+                ),
+            }
+        )
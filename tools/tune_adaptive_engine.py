@@ -0,0 +1,214 @@
+"""
+Parameter sweep for AdaptiveEngine.
+
+Runs every combination of window_size / up_threshold / down_threshold
+against a population of synthetic learners and reports, per grid cell:
+
+- time to level: questions from the moment a level starts to suit the
+  learner (session start, or the learner improving) until the engine
+  first serves it (lower is better)
+- oscillation: direction reversals per question, e.g. up then straight
+  back down (lower is better)
+
+Grid cells are spread across a process pool.
+
+Run from the project root:
+    python tools/tune_adaptive_engine.py --runs 200 --questions 60
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.adaptive_engine import AdaptiveEngine  # noqa: E402
+from src.tracker import PerformanceTracker  # noqa: E402
+
+# How hard each level is on the same scale as learner skill
+LEVEL_DIFFICULTY = {"easy": 0.0, "medium": 1.5, "hard": 3.0}
+
+# A level "suits" the learner when they get it right at least this often
+TARGET_ACCURACY = 0.75
+
+
+@dataclass
+class LearnerModel:
+    """
+    Synthetic learner whose skill follows a saturating learning curve:
+
+        skill(t) = start + gain * (1 - exp(-t / pace))
+    """
+
+    name: str
+    start: float
+    gain: float
+    pace: float
+
+    def skill(self, t: int) -> float:
+        return self.start + self.gain * (1 - math.exp(-t / self.pace))
+
+    def p_correct(self, level: str, t: int) -> float:
+        return 1 / (1 + math.exp(-(self.skill(t) - LEVEL_DIFFICULTY[level])))
+
+    def best_level(self, levels: List[str], t: int) -> str:
+        best = levels[0]
+        for level in levels:
+            if self.p_correct(level, t) >= TARGET_ACCURACY:
+                best = level
+        return best
+
+
+LEARNERS = [
+    LearnerModel("beginner", start=0.5, gain=0.5, pace=30),
+    LearnerModel("steady", start=1.5, gain=1.5, pace=40),
+    LearnerModel("fast", start=1.0, gain=4.0, pace=10),
+    LearnerModel("strong", start=4.5, gain=0.5, pace=20),
+    LearnerModel("plateau", start=2.0, gain=1.0, pace=5),
+]
+
+
+def simulate(
+    learner: LearnerModel,
+    params: Tuple[int, float, float],
+    num_questions: int,
+    rng: random.Random,
+) -> Tuple[int, int, int]:
+    """
+    Run one session. Returns (total questions spent catching up to the
+    suitable level, number of times it changed, number of direction
+    reversals).
+    """
+    window_size, up_threshold, down_threshold = params
+    engine = AdaptiveEngine(
+        initial_level="easy",
+        window_size=window_size,
+        up_threshold=up_threshold,
+        down_threshold=down_threshold,
+    )
+    tracker = PerformanceTracker()
+
+    target = None
+    target_since = 0
+    caught_up = True
+    total_lag = 0
+    targets = 0
+    reversals = 0
+    last_step = 0
+
+    for t in range(num_questions):
+        level = engine.current_level
+        best = learner.best_level(engine.levels, t)
+        if best != target:
+            if not caught_up:
+                total_lag += t - target_since
+            target, target_since, caught_up = best, t, False
+            targets += 1
+        if not caught_up and level == target:
+            total_lag += t - target_since
+            caught_up = True
+
+        correct = rng.random() < learner.p_correct(level, t)
+        tracker.log_attempt(
+            question="",
+            correct_answer=0,
+            user_answer=None,
+            correct=correct,
+            time_taken=0.0,
+            difficulty=level,
+        )
+
+        before = engine.current_index
+        engine.update_level(tracker.recent_correctness(n=engine.window_size))
+        step = engine.current_index - before
+
+        if step:
+            if last_step and step != last_step:
+                reversals += 1
+            last_step = step
+
+    if not caught_up:
+        total_lag += num_questions - target_since
+
+    return total_lag, targets, reversals
+
+
+def run_cell(args: Tuple[Tuple[int, float, float], int, int, int]) -> Dict:
+    """Evaluate one grid cell over every learner model (runs in a worker)."""
+    params, runs, num_questions, seed = args
+    rng = random.Random(f"{seed}-{params}")
+
+    total_lag = 0
+    total_targets = 0
+    total_reversals = 0
+    for learner in LEARNERS:
+        for _ in range(runs):
+            lag, targets, reversals = simulate(learner, params, num_questions, rng)
+            total_lag += lag
+            total_targets += targets
+            total_reversals += reversals
+
+    sessions = runs * len(LEARNERS)
+    window_size, up_threshold, down_threshold = params
+    return {
+        "window_size": window_size,
+        "up_threshold": up_threshold,
+        "down_threshold": down_threshold,
+        "time_to_level": total_lag / total_targets,
+        "oscillation": total_reversals / (sessions * num_questions),
+    }
+
+
+def parse_floats(raw: str) -> List[float]:
+    return [float(x) for x in raw.split(",")]
+
+
+def parse_ints(raw: str) -> List[int]:
+    return [int(x) for x in raw.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep AdaptiveEngine parameters.")
+    parser.add_argument("--windows", type=parse_ints, default=[3, 4, 5, 6, 8, 10])
+    parser.add_argument("--up", type=parse_floats, default=[0.6, 0.7, 0.8, 0.9, 1.0])
+    parser.add_argument("--down", type=parse_floats, default=[0.2, 0.3, 0.4, 0.5, 0.6])
+    parser.add_argument("--runs", type=int, default=100, help="sessions per learner per cell")
+    parser.add_argument("--questions", type=int, default=50, help="questions per session")
+    parser.add_argument("--workers", type=int, default=None, help="defaults to CPU count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=20, help="rows to print")
+    args = parser.parse_args()
+
+    grid = [
+        (w, up, down)
+        for w, up, down in itertools.product(args.windows, args.up, args.down)
+        if down < up
+    ]
+    tasks = [(params, args.runs, args.questions, args.seed) for params in grid]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(run_cell, tasks, chunksize=max(1, len(tasks) // 64)))
+    elapsed = time.perf_counter() - start
+
+    results.sort(key=lambda r: (r["time_to_level"], r["oscillation"]))
+
+    print(f"{'window':>6} {'up':>5} {'down':>5} {'time to level':>14} {'oscillation':>12}")
+    for r in results[: args.top]:
+        print(
+            f"{r['window_size']:>6} {r['up_threshold']:>5.2f} {r['down_threshold']:>5.2f} "
+            f"{r['time_to_level']:>14.2f} {r['oscillation']:>12.4f}"
+        )
+
+    sessions = len(grid) * len(LEARNERS) * args.runs
+    print(f"\n{len(grid)} cells, {sessions} sessions in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()